@@ -2,8 +2,10 @@
 Calculator module with pure Python functions for mathematical operations.
 Includes comprehensive error handling for edge cases.
 """
+import ast
 import math
 import re
+from functools import lru_cache
 from typing import Union
 
 
@@ -36,12 +38,18 @@ def divide(a: float, b: float) -> float:
 
 def power(base: float, exponent: float) -> float:
     """Raise base to the power of exponent."""
+    if base == 0 and exponent < 0:
+        raise CalculatorError("Cannot raise zero to a negative power")
+    if base < 0 and math.isfinite(exponent) and not float(exponent).is_integer():
+        raise CalculatorError("Cannot raise a negative number to a fractional power")
+    # log2(|base ** exponent|) predicts overflow without computing the power.
+    # The margin absorbs rounding in log2; borderline cases fall through below.
+    if base and exponent * math.log2(abs(base)) > 1025:
+        raise CalculatorError("Number too large to represent")
     try:
         result = base ** exponent
-        if math.isinf(result):
-            raise CalculatorError("Result is infinity")
-        if math.isnan(result):
-            raise CalculatorError("Invalid operation resulting in NaN")
+        if not math.isfinite(result):
+            raise CalculatorError("Result is infinity" if math.isinf(result) else "Invalid operation resulting in NaN")
         return result
     except OverflowError:
         raise CalculatorError("Number too large to represent")
@@ -61,6 +69,80 @@ def modulus(a: float, b: float) -> float:
     return a % b
 
 
+# Operator types permitted in binary and unary expressions
+_ALLOWED_OPS = {ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow, ast.USub, ast.UAdd}
+
+# Function names that may be called from an expression
+_ALLOWED_FUNCS = {"sqrt", "log", "sin", "cos", "tan", "abs"}
+
+# Namespace compiled expressions are evaluated in; builtins are disabled and
+# only the whitelisted functions resolve. Expressions cannot assign, so it is
+# safe to share across calls.
+_SAFE_GLOBALS = {
+    "__builtins__": {},
+    "sqrt": math.sqrt,
+    "log": math.log,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "abs": abs
+}
+
+# Permitted characters and function names, checked in a single pass once
+# whitespace is removed. Each repetition consumes exactly one character or one
+# name, which keeps matching linear (no nested quantifiers to backtrack into).
+_EXPR_TOKEN_RE = re.compile(r"(?:[0-9+\-*/%().,]|" + "|".join(sorted(_ALLOWED_FUNCS)) + r")+")
+
+
+def _compile_expr(expression: str):
+    """Parse, validate and compile an expression to a code object."""
+    # Deeply nested input can exceed the parser's or compiler's limits
+    try:
+        tree = ast.parse(expression, mode="eval")
+        _validate(tree)
+        return compile(tree, "<expr>", "eval")
+    except SyntaxError as e:
+        raise CalculatorError(f"Invalid expression: {e.msg}")
+    except (RecursionError, MemoryError):
+        raise CalculatorError("Expression is too deeply nested")
+
+
+def _validate(tree: ast.Expression) -> None:
+    """
+    Reject any node outside the whitelist, stopping at the first violation.
+    Children are pushed per node type rather than via ast.iter_child_nodes,
+    since every permitted node has a fixed, known shape.
+    """
+    stack = [tree.body]
+    while stack:
+        node = stack.pop()
+        node_type = type(node)
+        if node_type is ast.BinOp:
+            if type(node.op) not in _ALLOWED_OPS:
+                raise CalculatorError("Expression contains invalid characters")
+            stack.append(node.left)
+            stack.append(node.right)
+        elif node_type is ast.Constant:
+            if type(node.value) not in (int, float):
+                raise CalculatorError("Expression contains invalid characters")
+        elif node_type is ast.Call:
+            if type(node.func) is not ast.Name:
+                raise CalculatorError("Only named functions may be called")
+            if node.keywords:
+                raise CalculatorError("Keyword arguments are not supported")
+            stack.append(node.func)
+            stack.extend(node.args)
+        elif node_type is ast.UnaryOp:
+            if type(node.op) not in _ALLOWED_OPS:
+                raise CalculatorError("Expression contains invalid characters")
+            stack.append(node.operand)
+        elif node_type is ast.Name:
+            if node.id not in _ALLOWED_FUNCS:
+                raise CalculatorError(f"Unknown name: {node.id}")
+        else:
+            raise CalculatorError("Expression contains invalid characters")
+
+
 def evaluate_expression(expression: str) -> float:
     """
     Safely evaluate a mathematical expression.
@@ -69,43 +151,52 @@ def evaluate_expression(expression: str) -> float:
     if not expression or not isinstance(expression, str):
         raise CalculatorError("Invalid expression")
     
-    # Remove whitespace
+    # Remove whitespace so equivalent expressions share a cache entry
     expression = expression.replace(" ", "")
-    
-    # Check for invalid characters
-    allowed_chars = set("0123456789+-*/().**sqrt()log()sin()cos()tan()abs().")
-    if not all(c in allowed_chars or c.isdigit() or c in "+-*/()" for c in expression):
+    if len(expression) > _MAX_CACHED_LEN:
+        return _evaluate(expression)
+    return _evaluate_cached(expression)
+
+
+# Only expressions up to this length are memoized, so the cache cannot pin
+# arbitrarily large request strings in memory
+_MAX_CACHED_LEN = 256
+
+
+def _evaluate(expression: str) -> float:
+    """Evaluate a whitespace-free expression."""
+    # Check for invalid characters and unknown functions
+    if not _EXPR_TOKEN_RE.fullmatch(expression):
         raise CalculatorError("Expression contains invalid characters")
     
+    # Plain numeric literals need no parsing
+    try:
+        result = float(expression)
+    except ValueError:
+        pass
+    else:
+        if not math.isfinite(result):
+            raise CalculatorError("Result is infinity")
+        return result
+    
     # Check for balanced parentheses
     if expression.count("(") != expression.count(")"):
         raise CalculatorError("Unbalanced parentheses")
     
-    # Replace mathematical functions with math module equivalents
-    safe_expression = expression.replace("sqrt", "math.sqrt")
-    safe_expression = safe_expression.replace("log", "math.log")
-    safe_expression = safe_expression.replace("sin", "math.sin")
-    safe_expression = safe_expression.replace("cos", "math.cos")
-    safe_expression = safe_expression.replace("tan", "math.tan")
-    safe_expression = safe_expression.replace("abs", "abs")
-    
-    # Define safe namespace for evaluation
-    safe_dict = {
-        "__builtins__": {},
-        "math": math,
-        "abs": abs
-    }
+    code = _compile_expr(expression)
     
     try:
-        result = eval(safe_expression, safe_dict)
-        if math.isinf(result):
-            raise CalculatorError("Result is infinity")
-        if math.isnan(result):
-            raise CalculatorError("Invalid operation resulting in NaN")
+        result = eval(code, _SAFE_GLOBALS)
+        if not math.isfinite(result):
+            raise CalculatorError("Result is infinity" if math.isinf(result) else "Invalid operation resulting in NaN")
         return float(result)
     except ZeroDivisionError:
         raise CalculatorError("Division by zero in expression")
-    except (ValueError, TypeError, SyntaxError) as e:
+    except (ValueError, TypeError) as e:
         raise CalculatorError(f"Invalid expression: {str(e)}")
     except Exception as e:
-        raise CalculatorError(f"Error evaluating expression: {str(e)}")
\ No newline at end of file
+        raise CalculatorError(f"Error evaluating expression: {str(e)}")
+
+
+# Results are memoized per process; errors are raised, never cached
+_evaluate_cached = lru_cache(maxsize=4096)(_evaluate)
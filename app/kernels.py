@@ -0,0 +1,31 @@
+"""
+Numeric kernel used by the /batch endpoint for large power workloads.
+Compiled with numba when it is installed; without numba, /batch computes
+power one item at a time.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # fastmath is left off so results stay bit-identical to the scalar
+    # calculator functions; error_model="numpy" yields inf/nan instead of raising.
+    # The kernel stays single-threaded; scale out with server worker processes instead.
+    @njit(cache=True, error_model="numpy")
+    def vec_power(base, exponent, out):
+        """Raise each base to the matching exponent, writing into out."""
+        for i in range(base.shape[0]):
+            out[i] = base[i] ** exponent[i]
+        return out
+
+
+def warm_up() -> None:
+    """Trigger JIT compilation so the first request does not pay for it."""
+    if NUMBA_AVAILABLE:
+        values = np.ones(1, dtype=np.float64)
+        vec_power(values, values, np.empty_like(values))
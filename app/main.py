@@ -1,22 +1,40 @@
 """
 FastAPI Calculator API with endpoints for mathematical operations and history tracking.
 """
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict, Any
-import datetime
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ValidationError
+from typing import List, Dict, Any, Optional, Tuple
+from collections import deque
+from contextlib import asynccontextmanager
+import os
+import sys
+import time
+import numpy as np
 import uvicorn
 
 from .calculator import (
     add, subtract, multiply, divide, power, square_root, modulus, 
     evaluate_expression, CalculatorError
 )
+from . import kernels
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Compile the numeric kernel before the first request arrives."""
+    kernels.warm_up()
+    yield
 
 
 app = FastAPI(
     title="Calculator API",
     description="A comprehensive calculator API with basic and advanced mathematical operations",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 
@@ -45,22 +63,162 @@ class OperationResponse(BaseModel):
     timestamp: str
 
 
-# In-memory history storage (in production, use a database)
-calculation_history: List[OperationResponse] = []
+class BatchItem(BaseModel):
+    op: str
+    args: Dict[str, float]
+
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem]
+
+
+class BatchItemResult(BaseModel):
+    op: str
+    result: Optional[float] = None
+    error: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    results: List[BatchItemResult]
 
 
-def add_to_history(operation: str, input_data: Dict[str, Any], result: float) -> OperationResponse:
-    """Add a calculation to the history."""
-    response = OperationResponse(
+# In-memory history storage (in production, use a database).
+# Bounded so memory and /history payload size stay capped; oldest entries are dropped first.
+HISTORY_MAXLEN = int(os.environ.get("CALCULATOR_HISTORY_MAXLEN", "10000"))
+calculation_history: deque = deque(maxlen=HISTORY_MAXLEN)
+
+
+# (epoch second, formatted local "YYYY-MM-DDTHH:MM:SS") of the last timestamp produced
+_timestamp_cache = (0, "")
+
+
+def _fast_timestamp() -> str:
+    """Return the current local time in ISO 8601 format, formatting each second only once."""
+    global _timestamp_cache
+    ns = time.time_ns()
+    sec = ns // 1_000_000_000
+    cached_sec, prefix = _timestamp_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec))
+        _timestamp_cache = (sec, prefix)
+    return f"{prefix}.{ns % 1_000_000_000 // 1000:06d}"
+
+
+def _history_entry(operation: str, input_data: Dict[str, Any], result: float) -> OperationResponse:
+    """Build a history entry for a calculation."""
+    # Every field is produced by this module, so skip pydantic validation
+    return OperationResponse.model_construct(
         operation=operation,
         input=input_data,
         result=result,
-        timestamp=datetime.datetime.now().isoformat()
+        timestamp=_fast_timestamp()
     )
-    calculation_history.append(response)
+
+
+async def _append_history(*entries: OperationResponse) -> None:
+    """Append entries to the history (async, so background tasks run it on the event loop)."""
+    calculation_history.extend(entries)
+
+
+def add_to_history(
+    operation: str, input_data: Dict[str, Any], result: float, background: BackgroundTasks
+) -> OperationResponse:
+    """Add a calculation to the history once the response has been sent."""
+    response = _history_entry(operation, input_data, result)
+    background.add_task(_append_history, response)
     return response
 
 
+def _json_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model to JSON in one pydantic-core pass.
+    Returning a Response bypasses FastAPI's re-validation of the model against
+    response_model, which is kept on the routes for the OpenAPI schema only.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+# Table-driven operations: name -> (function, request model, argument names,
+# history label, input builder). The builder copies a validated request's
+# operands into a fresh history input dict with a plain dict literal.
+# Used by /op/{name}, the per-operation aliases and /batch.
+_OPS = {
+    "add": (add, OperationRequest, ("a", "b"), "addition", lambda r: {"a": r.a, "b": r.b}),
+    "subtract": (subtract, OperationRequest, ("a", "b"), "subtraction", lambda r: {"a": r.a, "b": r.b}),
+    "multiply": (multiply, OperationRequest, ("a", "b"), "multiplication", lambda r: {"a": r.a, "b": r.b}),
+    "divide": (divide, OperationRequest, ("a", "b"), "division", lambda r: {"a": r.a, "b": r.b}),
+    "power": (power, PowerRequest, ("base", "exponent"), "power",
+              lambda r: {"base": r.base, "exponent": r.exponent}),
+    "sqrt": (square_root, SingleOperandRequest, ("value",), "square_root", lambda r: {"value": r.value}),
+    "modulus": (modulus, OperationRequest, ("a", "b"), "modulus", lambda r: {"a": r.a, "b": r.b}),
+}
+
+
+# Operations that cannot raise on validated float operands, so need no error handling
+_INFALLIBLE_OPS = frozenset({"add", "subtract", "multiply"})
+
+
+def _apply_operation(name: str, request: BaseModel, background: BackgroundTasks) -> Response:
+    """Run a table operation on a validated request and record it in history."""
+    fn, _, _, label, inputs = _OPS[name]
+    input_data = inputs(request)
+    if name in _INFALLIBLE_OPS:
+        result = fn(*input_data.values())
+    else:
+        try:
+            result = fn(*input_data.values())
+        except CalculatorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    return _json_response(add_to_history(label, input_data, result, background))
+
+
+# Array counterparts of _OPS, used by /batch for large same-operation groups
+_VECTOR_OPS = {
+    "add": np.add,
+    "subtract": np.subtract,
+    "multiply": np.multiply,
+    "divide": np.divide,
+    "sqrt": np.sqrt,
+    "modulus": np.mod,
+}
+
+# np.power can differ from Python's ** in the last bit, so power is only
+# vectorized through the numba kernel, which uses the same libm pow.
+if kernels.NUMBA_AVAILABLE:
+    _VECTOR_OPS["power"] = kernels.vec_power
+
+# Below this many items of one operation the plain Python loop is faster
+_VECTORIZE_MIN = 64
+
+
+def _vectorize(op: str, items: List[BatchItem]) -> List[Optional[float]]:
+    """
+    Compute one operation over many batch items with NumPy.
+    Non-finite results (zero divisors, negative roots, overflow) come back as None
+    so the scalar function can produce the exact result or error for those rows.
+    """
+    columns = [
+        np.fromiter((item.args[k] for item in items), dtype=np.float64, count=len(items))
+        for k in _OPS[op][2]
+    ]
+    out = np.empty(len(items), dtype=np.float64)
+    with np.errstate(all="ignore"):
+        _VECTOR_OPS[op](*columns, out=out)
+    return [value if ok else None for value, ok in zip(out.tolist(), np.isfinite(out).tolist())]
+
+
+# Handlers are `async def` on purpose. Every operation is microseconds of CPU
+# work with no I/O, so running it inline on the event loop is cheaper than the
+# threadpool hop FastAPI makes for plain `def` handlers. Anything that can take
+# long enough to stall the loop (evaluating a long expression) is offloaded
+# explicitly with run_in_threadpool.
+
+# Expressions at least this long are evaluated in the threadpool
+_EVALUATE_OFFLOAD_LEN = 256
+
+
 @app.get("/")
 async def root():
     """Welcome message and API information."""
@@ -68,73 +226,64 @@ async def root():
         "message": "Welcome to Calculator API",
         "version": "1.0.0",
         "endpoints": {
-            "operations": ["/add", "/subtract", "/multiply", "/divide", "/power", "/sqrt", "/modulus", "/evaluate"],
+            "operations": ["/add", "/subtract", "/multiply", "/divide", "/power", "/sqrt", "/modulus", "/evaluate", "/batch", "/op/{name}"],
             "history": ["/history", "/history (DELETE)"]
         }
     }
 
 
+@app.post("/op/{name}", response_model=OperationResponse)
+async def run_operation(name: str, http_request: Request, background: BackgroundTasks):
+    """Run any table operation by name, e.g. POST /op/add with {"a": 1, "b": 2}."""
+    if name not in _OPS:
+        raise HTTPException(status_code=404, detail=f"Unknown operation: {name}")
+    # Parse the raw body straight into the operation's model in one pydantic-core
+    # pass instead of json.loads into a dict and validating that.
+    try:
+        request = _OPS[name][1].model_validate_json(await http_request.body())
+    except ValidationError as e:
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in e.errors()])
+    return _apply_operation(name, request, background)
+
+
 @app.post("/add", response_model=OperationResponse)
-async def add_numbers(request: OperationRequest):
+async def add_numbers(request: OperationRequest, background: BackgroundTasks):
     """Add two numbers."""
-    try:
-        result = add(request.a, request.b)
-        return add_to_history("addition", {"a": request.a, "b": request.b}, result)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return _apply_operation("add", request, background)
 
 
 @app.post("/subtract", response_model=OperationResponse)
-async def subtract_numbers(request: OperationRequest):
+async def subtract_numbers(request: OperationRequest, background: BackgroundTasks):
     """Subtract second number from first."""
-    try:
-        result = subtract(request.a, request.b)
-        return add_to_history("subtraction", {"a": request.a, "b": request.b}, result)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return _apply_operation("subtract", request, background)
 
 
 @app.post("/multiply", response_model=OperationResponse)
-async def multiply_numbers(request: OperationRequest):
+async def multiply_numbers(request: OperationRequest, background: BackgroundTasks):
     """Multiply two numbers."""
-    try:
-        result = multiply(request.a, request.b)
-        return add_to_history("multiplication", {"a": request.a, "b": request.b}, result)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return _apply_operation("multiply", request, background)
 
 
 @app.post("/divide", response_model=OperationResponse)
-async def divide_numbers(request: OperationRequest):
+async def divide_numbers(request: OperationRequest, background: BackgroundTasks):
     """Divide first number by second."""
-    try:
-        result = divide(request.a, request.b)
-        return add_to_history("division", {"a": request.a, "b": request.b}, result)
-    except CalculatorError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return _apply_operation("divide", request, background)
 
 
 @app.post("/power", response_model=OperationResponse)
-async def power_operation(request: PowerRequest):
+async def power_operation(request: PowerRequest, background: BackgroundTasks):
     """Raise base to the power of exponent."""
-    try:
-        result = power(request.base, request.exponent)
-        return add_to_history("power", {"base": request.base, "exponent": request.exponent}, result)
-    except CalculatorError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return _apply_operation("power", request, background)
 
 
 @app.post("/sqrt", response_model=OperationResponse)
-async def square_root_operation(request: SingleOperandRequest):
+async def square_root_operation(request: SingleOperandRequest, background: BackgroundTasks):
     """
     Calculate the square root of a number provided in the request.
 
     Args:
         request (SingleOperandRequest): A request object containing a single operand for the operation.
+        background (BackgroundTasks): Records the operation in history after the response is sent.
 
     Returns:
         JSONResponse: A JSON response containing the operation details and result.
@@ -143,57 +292,111 @@ async def square_root_operation(request: SingleOperandRequest):
         HTTPException: If a CalculatorError occurs, with a status code of 400.
         HTTPException: For any other exceptions, with a status code of 500.
     """
-    try:
-        # Compute the square root of the input value.
-        result = square_root(request.value)
-        # Add the operation to the history and return the result.
-        return add_to_history("square_root", {"value": request.value}, result)
-    except CalculatorError as e:
-        # Handle specific calculator errors with a 400 response.
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        # Handle unexpected errors with a 500 response.
-        raise HTTPException(status_code=500, detail=str(e))
+    return _apply_operation("sqrt", request, background)
 
 
 @app.post("/modulus", response_model=OperationResponse)
-async def modulus_operation(request: OperationRequest):
+async def modulus_operation(request: OperationRequest, background: BackgroundTasks):
     """Calculate modulus (remainder) of division."""
-    try:
-        result = modulus(request.a, request.b)
-        return add_to_history("modulus", {"a": request.a, "b": request.b}, result)
-    except CalculatorError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return _apply_operation("modulus", request, background)
 
 
 @app.post("/evaluate", response_model=OperationResponse)
-async def evaluate_math_expression(request: ExpressionRequest):
+async def evaluate_math_expression(request: ExpressionRequest, background: BackgroundTasks):
     """Evaluate a mathematical expression."""
     try:
-        result = evaluate_expression(request.expression)
-        return add_to_history("evaluate", {"expression": request.expression}, result)
+        if len(request.expression) >= _EVALUATE_OFFLOAD_LEN:
+            result = await run_in_threadpool(evaluate_expression, request.expression)
+        else:
+            result = evaluate_expression(request.expression)
+        return _json_response(add_to_history("evaluate", {"expression": request.expression}, result, background))
     except CalculatorError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/batch", response_model=BatchResponse)
+async def batch_operations(request: BatchRequest, background: BackgroundTasks):
+    """Run several operations in one request, reporting errors per item."""
+    # Results are plain dicts serialized in one orjson pass; BatchResponse is
+    # kept on the route for the OpenAPI schema only. Per-row model building
+    # would cost far more than the arithmetic itself.
+    items = request.items
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    groups: Dict[str, List[int]] = {}
+    for i, item in enumerate(items):
+        if item.op not in _OPS:
+            results[i] = {"op": item.op, "result": None, "error": f"Unknown operation: {item.op}"}
+            continue
+        missing = [k for k in _OPS[item.op][2] if k not in item.args]
+        if missing:
+            results[i] = {"op": item.op, "result": None, "error": f"Missing arguments: {', '.join(missing)}"}
+            continue
+        groups.setdefault(item.op, []).append(i)
+    
+    vectorized: Dict[int, Optional[float]] = {}
+    for op, indices in groups.items():
+        if op in _VECTOR_OPS and len(indices) >= _VECTORIZE_MIN:
+            vectorized.update(zip(indices, _vectorize(op, [items[i] for i in indices])))
+    
+    done: List[Tuple[BatchItem, float]] = []
+    for i, item in enumerate(items):
+        if results[i] is not None:
+            continue
+        result = vectorized.get(i)
+        if result is None:
+            fn, _, keys, _, _ = _OPS[item.op]
+            try:
+                result = fn(*[item.args[k] for k in keys])
+            except Exception as e:
+                # Calculator errors and unexpected failures alike are reported
+                # per item, so one bad item never fails the whole batch.
+                results[i] = {"op": item.op, "result": None, "error": str(e)}
+                continue
+        results[i] = {"op": item.op, "result": result, "error": None}
+        done.append((item, result))
+    if done:
+        background.add_task(_append_batch_history, done, _fast_timestamp())
+    return ORJSONResponse({"results": results})
+
+
+async def _append_batch_history(done: List[Tuple[BatchItem, float]], timestamp: str) -> None:
+    """Record successful batch items in history, built after the response is sent."""
+    calculation_history.extend(
+        OperationResponse.model_construct(
+            operation=_OPS[item.op][3],
+            input={k: item.args[k] for k in _OPS[item.op][2]},
+            result=result,
+            timestamp=timestamp
+        )
+        for item, result in done
+    )
+
+
 @app.get("/history", response_model=List[OperationResponse])
 async def get_history():
     """Get calculation history."""
-    return calculation_history
+    return list(calculation_history)
 
 
 @app.delete("/history")
 async def clear_history():
     """Clear calculation history."""
-    global calculation_history
     count = len(calculation_history)
     calculation_history.clear()
     return {"message": f"History cleared. Removed {count} entries."}
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Each worker is a separate process with its own in-memory history, so
+    # GET /history only shows calculations served by the worker that answers it.
+    # Sharing history across workers needs an external store (e.g. Redis).
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=int(os.environ.get("CALCULATOR_WORKERS", os.cpu_count() or 1))
+    )
\ No newline at end of file
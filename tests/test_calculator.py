@@ -12,7 +12,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
 
 from calculator import (
     add, subtract, multiply, divide, power, square_root, modulus, 
-    evaluate_expression, CalculatorError
+    evaluate_expression, CalculatorError, _compile_expr, _evaluate_cached, _MAX_CACHED_LEN
 )
 
 
@@ -65,12 +65,29 @@ class TestCalculator(unittest.TestCase):
         self.assertEqual(power(9, 0.5), 3.0)
         self.assertEqual(power(-2, 2), 4)
         self.assertEqual(power(-2, 3), -8)
+        self.assertEqual(power(0, 2), 0)
+        self.assertEqual(power(-8, 3.0), -512)
+        
+        with self.assertRaises(CalculatorError) as context:
+            power(0, -1)
+        self.assertIn("zero to a negative power", str(context.exception))
+        with self.assertRaises(CalculatorError) as context:
+            power(-8, 0.5)
+        self.assertIn("negative number to a fractional power", str(context.exception))
     
     def test_power_edge_cases(self):
         """Test power operation edge cases."""
         # Test for overflow
         with self.assertRaises(CalculatorError):
             power(10, 1000)
+        with self.assertRaises(CalculatorError):
+            power(-10, 1001)
+        with self.assertRaises(CalculatorError):
+            power(2, 1024)
+        # Largest powers of two that still fit, and underflow to zero
+        self.assertEqual(power(2, 1023), 2.0 ** 1023)
+        self.assertEqual(power(0.5, -1023), 2.0 ** 1023)
+        self.assertEqual(power(0.5, 2000), 0.0)
     
     def test_square_root(self):
         """Test square root operation."""
@@ -143,6 +160,60 @@ class TestCalculator(unittest.TestCase):
         with self.assertRaises(CalculatorError):
             evaluate_expression("2 + a")
     
+    def test_evaluate_expression_rejects_unsafe_code(self):
+        """Test expression evaluation rejects names, attributes and calls outside the whitelist."""
+        for expression in ("__import__('os')", "math.sqrt(4)", "pow(2, 3)", "sqrt", "(1)(2)", "'a' * 3"):
+            with self.assertRaises(CalculatorError):
+                evaluate_expression(expression)
+        # '=' never passes the character whitelist, so check the AST validator directly
+        with self.assertRaises(CalculatorError) as context:
+            _compile_expr("log(8, base=2)")
+        self.assertIn("Keyword arguments", str(context.exception))
+    
+    def test_evaluate_expression_modulus_and_log_base(self):
+        """Test modulus operator and two-argument log in expressions."""
+        self.assertEqual(evaluate_expression("10 % 3"), 1)
+        self.assertAlmostEqual(evaluate_expression("log(8, 2)"), 3)
+    
+    def test_evaluate_expression_repeated_calls(self):
+        """Test repeated and whitespace-variant expressions give consistent results."""
+        self.assertEqual(evaluate_expression("1 + 2 * 3"), 7)
+        self.assertEqual(evaluate_expression("1+2*3"), 7)
+        for _ in range(2):
+            with self.assertRaises(CalculatorError):
+                evaluate_expression("1 / 0")
+    
+    def test_evaluate_expression_long_inputs_not_cached(self):
+        """Test only expressions up to the cache length limit are memoized."""
+        _evaluate_cached.cache_clear()
+        long_literal = "0." + "0" * 10_000 + "1"
+        self.assertEqual(evaluate_expression(long_literal), float(long_literal))
+        self.assertEqual(evaluate_expression("1+" * 200 + "1"), 201)
+        self.assertEqual(_evaluate_cached.cache_info().currsize, 0)
+        evaluate_expression("1" + "+1" * ((_MAX_CACHED_LEN - 1) // 2))
+        self.assertEqual(_evaluate_cached.cache_info().currsize, 1)
+    
+    def test_evaluate_expression_unknown_function_names(self):
+        """Test names built from or around allowed functions are rejected."""
+        for expression in ("sinx(1)", "logsin(1)", "sqrt(2)x", "1" * 5000 + "x"):
+            with self.assertRaises(CalculatorError):
+                evaluate_expression(expression)
+    
+    def test_evaluate_expression_numeric_literal(self):
+        """Test bare numeric literals evaluate to themselves."""
+        self.assertEqual(evaluate_expression("42"), 42.0)
+        self.assertEqual(evaluate_expression("3.14"), 3.14)
+        self.assertEqual(evaluate_expression("-2.5"), -2.5)
+        self.assertEqual(evaluate_expression(".5"), 0.5)
+        with self.assertRaises(CalculatorError):
+            evaluate_expression("1" * 400)
+    
+    def test_evaluate_expression_too_deeply_nested(self):
+        """Test expressions beyond the parser's limits raise CalculatorError."""
+        for expression in ("1" + "+1" * 20000, "-" * 50000 + "1", "(" * 500 + "1" + ")" * 500):
+            with self.assertRaises(CalculatorError):
+                evaluate_expression(expression)
+    
     def test_evaluate_expression_square_root_negative(self):
         """Test square root of negative in expression."""
         with self.assertRaises(CalculatorError):
@@ -0,0 +1,225 @@
+"""
+Unit tests for the FastAPI calculator app.
+Covers /batch, /op/{name}, background history recording and history timestamps.
+"""
+import asyncio
+import importlib
+import unittest
+import sys
+import os
+from collections import deque
+from datetime import datetime
+from unittest import mock
+
+# Add the repository root to the path so the app package imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import BackgroundTasks
+from fastapi.testclient import TestClient
+
+from app import main
+from app.calculator import add, subtract, multiply, divide, modulus, power, square_root, CalculatorError
+
+
+def scalar_outcome(fn, *args):
+    """Return (result, error) the way /batch reports a single item."""
+    try:
+        return fn(*args), None
+    except CalculatorError as e:
+        return None, str(e)
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(main.app)
+        main.calculation_history.clear()
+
+    def post_batch(self, items):
+        response = self.client.post("/batch", json={"items": items})
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def test_batch_per_item_errors(self):
+        """Test bad items are reported individually without failing the batch."""
+        results = self.post_batch([
+            {"op": "add", "args": {"a": 1, "b": 2}},
+            {"op": "nope", "args": {}},
+            {"op": "sqrt", "args": {"x": 1}},
+            {"op": "divide", "args": {"a": 1, "b": 0}},
+            {"op": "power", "args": {"base": 0, "exponent": -1}},
+            {"op": "power", "args": {"base": -8, "exponent": 0.5}},
+        ])
+        self.assertEqual(results[0], {"op": "add", "result": 3.0, "error": None})
+        self.assertEqual(results[1]["error"], "Unknown operation: nope")
+        self.assertEqual(results[2]["error"], "Missing arguments: value")
+        self.assertIn("Division by zero", results[3]["error"])
+        self.assertEqual(results[4]["error"], "Cannot raise zero to a negative power")
+        self.assertEqual(results[5]["error"], "Cannot raise a negative number to a fractional power")
+
+    def test_batch_vectorized_groups_match_scalar(self):
+        """Test groups large enough to vectorize give the scalar results and errors."""
+        values = [(7.5, 2.0), (1.0, 0.0), (-3.0, 0.5), (0.0, 0.0), (10.0, -4.0), (2.0, 3.0)] * 12
+        cases = [
+            ("add", add, ("a", "b"), values),
+            ("subtract", subtract, ("a", "b"), values),
+            ("multiply", multiply, ("a", "b"), values),
+            ("divide", divide, ("a", "b"), values),
+            ("modulus", modulus, ("a", "b"), values),
+            ("sqrt", square_root, ("value",), [(a,) for a, _ in values]),
+            ("power", power, ("base", "exponent"),
+             [(7.5, 2.0), (0.0, -1.0), (-3.0, 0.5), (10.0, -4.0), (2.5, 0.5), (10.0, 400.0)] * 12),
+        ]
+        for op, fn, keys, rows in cases:
+            with self.subTest(op=op):
+                self.assertGreaterEqual(len(rows), main._VECTORIZE_MIN)
+                results = self.post_batch([{"op": op, "args": dict(zip(keys, row))} for row in rows])
+                for row, item in zip(rows, results):
+                    self.assertEqual((item["result"], item["error"]), scalar_outcome(fn, *row), row)
+
+    def test_batch_records_history_in_request_order(self):
+        """Test successful batch items are added to history in request order."""
+        self.post_batch([
+            {"op": "add", "args": {"a": 1, "b": 2}},
+            {"op": "divide", "args": {"a": 1, "b": 0}},
+            {"op": "sqrt", "args": {"value": 9}},
+        ])
+        history = self.client.get("/history").json()
+        self.assertEqual([h["operation"] for h in history], ["addition", "square_root"])
+
+
+class TestOperationRoute(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(main.app)
+        main.calculation_history.clear()
+
+    def test_op_runs_named_operation(self):
+        """Test /op/{name} runs the table operation and matches the typed route."""
+        response = self.client.post("/op/power", json={"base": 2, "exponent": 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["result"], 1024.0)
+        self.assertEqual(response.json()["input"], {"base": 2.0, "exponent": 10.0})
+        typed = self.client.post("/power", json={"base": 2, "exponent": 10}).json()
+        self.assertEqual({**response.json(), "timestamp": None}, {**typed, "timestamp": None})
+
+    def test_op_input_lists_declared_arguments(self):
+        """Test the recorded input holds exactly each operation's arguments."""
+        bodies = {
+            "add": {"a": 1, "b": 2}, "subtract": {"a": 1, "b": 2}, "multiply": {"a": 1, "b": 2},
+            "divide": {"a": 1, "b": 2}, "modulus": {"a": 1, "b": 2},
+            "power": {"base": 2, "exponent": 3}, "sqrt": {"value": 4},
+        }
+        for name, body in bodies.items():
+            with self.subTest(name=name):
+                response = self.client.post(f"/op/{name}", json={**body, "extra": 9})
+                self.assertEqual(response.json()["input"], {k: float(v) for k, v in body.items()})
+
+    def test_op_unknown_name(self):
+        """Test an unknown operation name returns 404."""
+        response = self.client.post("/op/nope", json={"a": 1, "b": 2})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"detail": "Unknown operation: nope"})
+
+    def test_op_invalid_json(self):
+        """Test malformed JSON returns a 422 located at the body."""
+        response = self.client.post("/op/add", content=b"{bad")
+        self.assertEqual(response.status_code, 422)
+        error = response.json()["detail"][0]
+        self.assertEqual(error["type"], "json_invalid")
+        self.assertEqual(error["loc"], ["body"])
+
+    def test_op_invalid_fields(self):
+        """Test field errors use the same 422 body as the typed routes."""
+        body = {"a": "x"}
+        response = self.client.post("/op/add", json=body)
+        self.assertEqual(response.status_code, 422)
+        detail = response.json()["detail"]
+        self.assertEqual([(e["type"], e["loc"]) for e in detail],
+                         [("float_parsing", ["body", "a"]), ("missing", ["body", "b"])])
+        self.assertEqual(detail, self.client.post("/add", json=body).json()["detail"])
+
+    def test_op_calculator_error(self):
+        """Test calculator errors map to 400."""
+        response = self.client.post("/op/sqrt", json={"value": -1})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("negative number", response.json()["detail"])
+
+
+class TestHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(main.app)
+        main.calculation_history.clear()
+
+    def test_history_written_after_response(self):
+        """Test the history append is deferred until background tasks run."""
+        background = BackgroundTasks()
+        entry = main.add_to_history("addition", {"a": 1.0, "b": 2.0}, 3.0, background)
+        self.assertEqual(len(main.calculation_history), 0)
+        asyncio.run(background())
+        self.assertEqual(list(main.calculation_history), [entry])
+
+    def test_history_visible_after_request(self):
+        """Test entries appear in /history once the request has completed."""
+        self.client.post("/add", json={"a": 1, "b": 2})
+        self.client.post("/divide", json={"a": 1, "b": 0})
+        history = self.client.get("/history").json()
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history[0]["operation"], "addition")
+        self.assertEqual(history[0]["result"], 3.0)
+
+    def test_history_evicts_oldest_at_maxlen(self):
+        """Test the oldest entries are dropped once history is full."""
+        with mock.patch.object(main, "calculation_history", deque(maxlen=3)):
+            for a in range(5):
+                self.client.post("/add", json={"a": a, "b": 0})
+            history = self.client.get("/history").json()
+        self.assertEqual([h["result"] for h in history], [2.0, 3.0, 4.0])
+
+    def test_history_maxlen_from_environment(self):
+        """Test CALCULATOR_HISTORY_MAXLEN sets the history bound."""
+        try:
+            with mock.patch.dict(os.environ, {"CALCULATOR_HISTORY_MAXLEN": "5"}):
+                importlib.reload(main)
+            self.assertEqual(main.HISTORY_MAXLEN, 5)
+            self.assertEqual(main.calculation_history.maxlen, 5)
+        finally:
+            importlib.reload(main)
+        self.assertEqual(main.calculation_history.maxlen, main.HISTORY_MAXLEN)
+
+
+class TestTimestamp(unittest.TestCase):
+
+    def setUp(self):
+        main._timestamp_cache = (0, "")
+
+    def timestamp_at(self, ns):
+        with mock.patch.object(main.time, "time_ns", return_value=ns):
+            return main._fast_timestamp()
+
+    def test_timestamp_matches_isoformat(self):
+        """Test timestamps match datetime.isoformat with microseconds."""
+        sec = 1_700_000_000
+        for frac in (0, 1_000, 123_456_789, 999_999_999):
+            with self.subTest(frac=frac):
+                expected = datetime.fromtimestamp(sec).replace(microsecond=frac // 1000)
+                self.assertEqual(self.timestamp_at(sec * 1_000_000_000 + frac),
+                                 expected.isoformat(timespec="microseconds"))
+
+    def test_timestamp_zero_microseconds(self):
+        """Test a whole second still carries a six-digit fraction."""
+        stamp = self.timestamp_at(1_700_000_000 * 1_000_000_000)
+        self.assertTrue(stamp.endswith(".000000"))
+        self.assertEqual(datetime.fromisoformat(stamp).timestamp(), 1_700_000_000)
+
+    def test_timestamp_prefix_refreshes_each_second(self):
+        """Test the cached prefix is reused within a second and replaced after it."""
+        first = self.timestamp_at(1_700_000_000_500_000_000)
+        second = self.timestamp_at(1_700_000_001_000_000_000)
+        self.assertEqual(first[-6:], "500000")
+        self.assertEqual(datetime.fromisoformat(second).timestamp(), 1_700_000_001)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)